@@ -1,101 +1,376 @@
-import numpy as np
-from moviepy.video.io.VideoFileClip import VideoFileClip
-from moviepy.video.VideoClip import ColorClip
-from moviepy.audio.io.AudioFileClip import AudioFileClip
+from __future__ import annotations
+
 import argparse
+import functools
+import json
 import os
 import logging
+import multiprocessing
+import subprocess
+import sys
 import tempfile
 import shutil
-from tqdm import tqdm
+from typing import Any, Optional
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def validate_paths(audio_path, output_directory):
+# Frame size of the generated background
+VIDEO_SIZE = (1280, 720)
+
+# Frames per second actually encoded for the static background
+STILL_FRAME_RATE = 1
+
+# tqdm is imported on first use so that --help, argument errors and runs
+# without a terminal never load it
+_TQDM: Any = None
+
+def _lazy_import() -> Any:
+    """
+    Import tqdm once and cache it in a module global
+    """
+    global _TQDM
+    if _TQDM is None:
+        from tqdm import tqdm
+        _TQDM = tqdm
+    return _TQDM
+
+class _NullProgressBar:
     """
-    Validate input and output paths
+    Stand-in for tqdm when stderr is not a terminal
     """
-    if not os.path.exists(audio_path):
-        raise FileNotFoundError(f"Audio file not found: {audio_path}")
+    n = 0
+
+    def __enter__(self) -> _NullProgressBar:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    def update(self, n: int = 1) -> None:
+        self.n += n
+
+def _progress_bar(enabled: bool = True, **kwargs: Any) -> Any:
+    """
+    Return a tqdm progress bar on a terminal, and a no-op one otherwise
+    """
+    if not enabled or not sys.stderr.isatty():
+        return _NullProgressBar()
+    return _lazy_import()(**kwargs)
+
+# Output directories already checked or created by validate_paths
+_VALIDATED_DIRS: set[str] = set()
+
+def validate_paths(audio_path: str, output_directory: str) -> os.stat_result:
+    """
+    Validate input and output paths, returning the audio file's stat result
+    """
+    try:
+        audio_stat = os.stat(audio_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Audio file not found: {audio_path}") from None
     
+    # A bare file name has no directory component and lives in the current directory
+    output_directory = output_directory or '.'
+    if output_directory in _VALIDATED_DIRS:
+        return audio_stat
     if not os.path.exists(output_directory):
         os.makedirs(output_directory)
         logging.info(f"Created output directory: {output_directory}")
+    _VALIDATED_DIRS.add(output_directory)
+    return audio_stat
+
+@functools.lru_cache(maxsize=4096)
+def _probe(audio_path: str, mtime_ns: int, size: int) -> tuple[Optional[float], Optional[str]]:
+    """
+    Return the duration in seconds and the first audio codec of a file, or None
+    for either if unknown, using a single ffprobe call
+
+    The modification time and size only serve as part of the cache key, so a file
+    that changes on disk is probed again.
+    """
+    output = subprocess.check_output(
+        ['ffprobe', '-v', 'error', '-select_streams', 'a:0',
+         '-show_entries', 'format=duration:stream=codec_name', '-of', 'json', audio_path],
+        text=True,
+    )
+    info = json.loads(output)
+    streams = info.get('streams') or [{}]
+    try:
+        duration: Optional[float] = float(info.get('format', {}).get('duration'))
+    except (TypeError, ValueError):
+        duration = None
+    return duration, streams[0].get('codec_name')
+
+# Hardware H.264 encoders in order of preference
+HW_ENCODERS = ['h264_nvenc', 'h264_qsv', 'h264_videotoolbox', 'h264_amf']
+
+# Consumer GPUs limit concurrent encode sessions, so batches using a hardware
+# encoder run at most this many files at once
+HW_ENCODER_MAX_JOBS = 2
+
+@functools.lru_cache(maxsize=None)
+def _detect_hw_encoder() -> Optional[str]:
+    """
+    Return the first hardware H.264 encoder that ffmpeg can open, or None
+    """
+    encoders = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'],
+                              capture_output=True, text=True).stdout
+    for encoder in HW_ENCODERS:
+        if encoder not in encoders:
+            continue
+        # Being compiled in does not mean the hardware is present, so try a one-frame encode
+        probe = subprocess.run(
+            ['ffmpeg', '-v', 'error', '-f', 'lavfi', '-i', 'color=c=black:s=256x256',
+             '-frames:v', '1', '-c:v', encoder, '-f', 'null', '-'],
+            stdin=subprocess.DEVNULL, capture_output=True,
+        )
+        if probe.returncode == 0:
+            logging.info(f"Using hardware encoder: {encoder}")
+            return encoder
+    return None
+
+def _resolve_video_encoder(hwaccel: str) -> str:
+    """
+    Map a --hwaccel choice to an ffmpeg H.264 encoder name
+    """
+    if hwaccel == 'none':
+        return 'libx264'
+    if hwaccel == 'auto':
+        return _detect_hw_encoder() or 'libx264'
+    return f'h264_{hwaccel}'
+
+def _quality_params(video_encoder: str, crf: int) -> list[str]:
+    """
+    Translate an x264-style CRF value into the encoder's constant-quality option
+    """
+    if video_encoder == 'h264_nvenc':
+        return ['-cq', str(crf)]
+    if video_encoder == 'h264_qsv':
+        return ['-global_quality', str(crf)]
+    if video_encoder == 'h264_videotoolbox':
+        # VideoToolbox quality runs from 1 to 100, higher is better
+        return ['-q:v', str(max(1, round(100 - crf * 100 / 51)))]
+    if video_encoder == 'h264_amf':
+        return ['-rc', 'cqp', '-qp_i', str(crf), '-qp_p', str(crf)]
+    return ['-crf', str(crf)]
+
+# Output formats whose name is not a file extension ffmpeg recognises, and the muxer to use
+MUXERS = {'3gpp': '3gp', 'mpeg1': 'mpeg', 'mpeg2': 'vob', 'mpegps': 'vob', 'mpeg4': 'mp4'}
+
+# MPEG program stream formats, which only carry MPEG audio, AC-3 or PCM
+MPEG_PS_FORMATS = ('mpeg1', 'mpeg2', 'mpegps', 'mpg')
+
+# Formats aimed at mobile and other low-power players
+LOW_POWER_FORMATS = ('3gpp', 'flv')
 
-def create_simple_video(audio_path, output_path, output_format='mp4'):
+def _build_ffmpeg_params(output_format: str, preset: str, crf: int, pixel_format: str, audio_bitrate: str,
+                         faststart: bool, threads: int, source_audio_codec: Optional[str] = None,
+                         video_encoder: str = 'libx264', still_background: bool = False,
+                         fps: int = 30, tune: Optional[str] = None, profile: Optional[str] = None,
+                         fragmented: bool = False) -> list[str]:
+    """
+    Build the encoder and muxer arguments for the ffmpeg command line
+    """
+    copyable_audio: tuple[str, ...]
+    if output_format == 'webm':
+        params = ['-c:v', 'libvpx-vp9', '-crf', str(crf), '-b:v', '0', '-pix_fmt', pixel_format]
+        copyable_audio, audio_encoder = ('opus',), 'libopus'
+    else:
+        params = ['-c:v', video_encoder]
+        x264_params = []
+        # x264 preset names are not understood by the hardware encoders
+        if video_encoder == 'libx264':
+            params += ['-preset', preset]
+        params += _quality_params(video_encoder, crf) + ['-pix_fmt', pixel_format]
+        tunes = []
+        if still_background:
+            # One keyframe every 10 seconds is plenty for seeking in a static picture
+            params += ['-g', str(fps * 10)]
+            if video_encoder == 'libx264':
+                # Motion search, scene cuts and mb-tree do nothing useful on identical frames
+                tunes.append('stillimage')
+                x264_params += ['scenecut=0', 'no-mbtree=1', 'bframes=0']
+        if video_encoder == 'libx264':
+            # An extra tune such as fastdecode combines with stillimage
+            if tune:
+                tunes.append(tune)
+            if tunes:
+                params += ['-tune', ','.join(tunes)]
+        if profile:
+            # Low-power players may need a simpler profile; AMF only offers the constrained variant of the baseline profile
+            if video_encoder == 'h264_amf' and profile == 'baseline':
+                profile = 'constrained_baseline'
+            params += ['-profile:v', profile]
+        if video_encoder == 'libx264' and threads > 0:
+            # Frame-based threading parallelizes better than slices outside of low-latency streaming
+            x264_params += ['sliced-threads=0', f'threads={threads}', 'lookahead-threads=1']
+        if x264_params:
+            params += ['-x264-params', ':'.join(x264_params)]
+        if output_format in MPEG_PS_FORMATS:
+            # MP3 sources can be carried as they are
+            copyable_audio, audio_encoder = ('mp2', 'mp3'), 'mp2'
+        else:
+            copyable_audio, audio_encoder = ('aac',), 'aac'
+    # Audio that is already in a codec the container accepts is copied instead of re-encoded
+    if source_audio_codec in copyable_audio:
+        params += ['-c:a', 'copy']
+    else:
+        params += ['-c:a', audio_encoder, '-b:a', audio_bitrate]
+    # The moov atom can only be relocated by the MP4 family of muxers
+    if faststart and output_format in ('mp4', 'mov', '3gpp', 'mpeg4'):
+        if fragmented:
+            # Fragmented MP4 writes the header up front instead of rewriting the whole file at the end
+            params += ['-movflags', '+empty_moov+frag_keyframe+default_base_moof']
+        else:
+            params += ['-movflags', '+faststart']
+    if threads > 0:
+        params += ['-threads', str(threads)]
+    return params
+
+def _run_ffmpeg(command: list[str], duration: Optional[float], show_progress: bool = True) -> None:
+    """
+    Run ffmpeg, driving a progress bar from the -progress report on its stdout
+    """
+    total = round(duration) if duration else None
+    # Diagnostics go to a file so a chatty stderr can never block the progress pipe
+    with tempfile.TemporaryFile(mode='w+') as stderr_file:
+        process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                   stderr=stderr_file, text=True)
+        assert process.stdout is not None
+        with _progress_bar(show_progress, desc="Writing video", total=total, unit='s') as pbar:
+            for line in process.stdout:
+                if not line.startswith('out_time_us='):
+                    continue
+                try:
+                    seconds = int(line[len('out_time_us='):]) // 1_000_000
+                except ValueError:
+                    # Reported as N/A until the first packet is written
+                    continue
+                if total is not None:
+                    seconds = min(seconds, total)
+                pbar.update(seconds - pbar.n)
+        returncode = process.wait()
+        if returncode != 0:
+            stderr_file.seek(0)
+            errors = stderr_file.read().splitlines()
+            for error in errors:
+                logging.error(f"ffmpeg: {error}")
+            raise subprocess.CalledProcessError(returncode, command, stderr='\n'.join(errors))
+
+def _move_file(source_path: str, destination_path: str) -> None:
+    """
+    Move a file, renaming or hard-linking it when possible and copying otherwise
+    """
+    try:
+        os.replace(source_path, destination_path)
+    except OSError:
+        try:
+            os.link(source_path, destination_path)
+            os.unlink(source_path)
+        except OSError:
+            # Equivalent to shutil.copy2, spelled out; copyfile already uses the
+            # kernel's copy_file_range/sendfile fast paths where available
+            shutil.copyfile(source_path, destination_path)
+            shutil.copystat(source_path, destination_path)
+
+def create_simple_video(audio_path: str, output_path: str, output_format: str = 'mp4', fps: Optional[int] = None,
+                        preset: str = 'ultrafast', crf: int = 23, pixel_format: str = 'yuv420p',
+                        audio_bitrate: str = '192k', faststart: bool = True, threads: int = 0,
+                        hwaccel: str = 'auto', tune: Optional[str] = None,
+                        profile: Optional[str] = None, fragmented: bool = False,
+                        video_encoder: Optional[str] = None, show_progress: bool = True) -> None:
     """
     Convert audio to a simple video with a blank background
+
+    The black frames are generated by ffmpeg's lavfi color source, so no frame
+    data passes through Python. Unless fps asks for a constant frame rate, only
+    one frame per second is encoded. Low-power formats (3gpp, flv) default to the
+    baseline profile with the fastdecode tune.
     """
     # Validate paths
     output_directory = os.path.dirname(output_path)
-    validate_paths(audio_path, output_directory)
+    audio_stat = validate_paths(audio_path, output_directory)
     
-    # Use system's temporary directory
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Generate a temporary output path in the system's temp directory
+    # Encode next to the destination so the final move is a rename, using the
+    # system's temporary directory if the destination is not writable
+    try:
+        temp_dir_context = tempfile.TemporaryDirectory(prefix='.podcast_pixels-', dir=output_directory or '.')
+    except OSError:
+        temp_dir_context = tempfile.TemporaryDirectory()
+    with temp_dir_context as temp_dir:
+        # Generate a temporary output path in the temporary directory
         temp_output_path = os.path.join(temp_dir, f'temp_video.{output_format}')
         
         logging.info(f"Creating simple video from audio: {audio_path}")
         
         try:
-            # Load the audio file with progress indicator
-            logging.info("Loading audio file...")
-            with tqdm(desc="Loading audio", total=1) as pbar:
-                audio = AudioFileClip(audio_path)
-                pbar.update(1)
-            
-            # Create a blank black video clip
-            logging.info("Creating video clip...")
-            with tqdm(desc="Creating video", total=1) as pbar:
-                blank_clip = ColorClip(size=(1280, 720), color=(0, 0, 0), duration=audio.duration)
-                pbar.update(1)
-            
-            # Combine audio and video
-            logging.info("Combining audio and video...")
-            with tqdm(desc="Combining", total=1) as pbar:
-                video = blank_clip.with_audio(audio)
-                pbar.update(1)
+            duration, source_audio_codec = _probe(audio_path, audio_stat.st_mtime_ns, audio_stat.st_size)
+            # An encoder already resolved by the caller takes precedence over hwaccel
+            if output_format == 'webm':
+                video_encoder = 'libx264'
+            elif video_encoder is None:
+                video_encoder = _resolve_video_encoder(hwaccel)
+            width, height = VIDEO_SIZE
+            background = f'color=c=black:s={width}x{height}:r={STILL_FRAME_RATE}'
+            frame_rate = fps or STILL_FRAME_RATE
+            if duration:
+                # Bound the background to the audio length rather than relying on -shortest alone
+                background += f':d={duration}'
+            command = [
+                'ffmpeg', '-y', '-v', 'error', '-nostats', '-progress', 'pipe:1',
+                '-f', 'lavfi', '-i', background,
+                '-i', audio_path,
+                # Every frame is identical, so one per second is enough unless the
+                # caller asks for a higher rate, which -r fills by repeating frames
+                '-shortest', '-r', str(frame_rate),
+            ]
+            if output_format in LOW_POWER_FORMATS:
+                tune = tune or 'fastdecode'
+                profile = profile or 'baseline'
+            command += _build_ffmpeg_params(output_format, preset, crf, pixel_format,
+                                            audio_bitrate, faststart, threads, source_audio_codec,
+                                            video_encoder, still_background=True, fps=frame_rate,
+                                            tune=tune, profile=profile, fragmented=fragmented)
+            if output_format in MUXERS:
+                command += ['-f', MUXERS[output_format]]
+            command.append(temp_output_path)
             
             # Write the video file to the temporary location
             logging.info("Writing video file...")
-            video.write_videofile(temp_output_path, fps=30, logger='bar')
+            _run_ffmpeg(command, duration, show_progress)
             
             # Move the temporary file to the final output location
             logging.info("Moving to final location...")
-            with tqdm(desc="Finalizing", total=1) as pbar:
-                try:
-                    shutil.copy2(temp_output_path, output_path)
-                    logging.info(f"Video saved to: {output_path}")
-                except PermissionError:
-                    logging.warning(f"Permission denied when writing to {output_path}")
-                    # Try alternative locations for WSL compatibility
-                    fallback_locations = [
-                        os.path.join(os.path.expanduser("~"), "danyoga41.mp4"),
-                        os.path.join("/tmp", "danyoga41.mp4"),
-                        os.path.join(os.getcwd(), "danyoga41.mp4")
-                    ]
-                    
-                    for fallback_path in fallback_locations:
-                        try:
-                            shutil.copy2(temp_output_path, fallback_path)
-                            logging.info(f"Video saved to fallback location: {fallback_path}")
-                            output_path = fallback_path
-                            break
-                        except Exception as fallback_error:
-                            logging.debug(f"Fallback location {fallback_path} failed: {fallback_error}")
-                            continue
-                    else:
-                        logging.error("All output locations failed. Check permissions and try again.")
-                        raise PermissionError(f"Could not write to any location. Try specifying --output_path with a writable directory.")
-                except OSError as e:
-                    logging.error(f"Failed to copy file: {str(e)}")
-                    raise
-                pbar.update(1)
-            
-            # Clean up
-            audio.close()
-            video.close()
+            try:
+                _move_file(temp_output_path, output_path)
+                logging.info(f"Video saved to: {output_path}")
+            except PermissionError:
+                logging.warning(f"Permission denied when writing to {output_path}")
+                # Try alternative locations for WSL compatibility, keeping the file name
+                # so that files from a batch do not overwrite each other
+                output_filename = os.path.basename(output_path)
+                fallback_locations = [
+                    os.path.join(os.path.expanduser("~"), output_filename),
+                    os.path.join("/tmp", output_filename),
+                    os.path.join(os.getcwd(), output_filename)
+                ]
+                
+                for fallback_path in fallback_locations:
+                    try:
+                        _move_file(temp_output_path, fallback_path)
+                        logging.info(f"Video saved to fallback location: {fallback_path}")
+                        output_path = fallback_path
+                        break
+                    except Exception as fallback_error:
+                        logging.debug(f"Fallback location {fallback_path} failed: {fallback_error}")
+                        continue
+                else:
+                    logging.error("All output locations failed. Check permissions and try again.")
+                    raise PermissionError(f"Could not write to any location. Try specifying --output_path with a writable directory.")
+            except OSError as e:
+                logging.error(f"Failed to move file: {str(e)}")
+                raise
             
             logging.info(f"Simple video created: {output_path}")
             
@@ -103,50 +378,143 @@ def create_simple_video(audio_path, output_path, output_format='mp4'):
             logging.error(f"Error during video creation: {str(e)}")
             raise
 
-def create_audio_visualization(audio_path, output_path, vis_type, output_format='mp4'):
+def create_audio_visualization(audio_path: str, output_path: str, vis_type: str, output_format: str = 'mp4',
+                               **kwargs: Any) -> None:
     """
     Create an audio visualization video
     """
     logging.warning(f"Visualization type '{vis_type}' not implemented yet")
-    create_simple_video(audio_path, output_path, output_format)
+    create_simple_video(audio_path, output_path, output_format, **kwargs)
+
+# Extensions picked up when a directory is given as input
+AUDIO_EXTENSIONS = ['mp3', 'm4a', 'wav']
+
+def expand_audio_paths(paths: list[str]) -> list[str]:
+    """
+    Expand directories in the input list into the audio files they contain
+    """
+    audio_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            # A single directory listing instead of one glob per extension
+            with os.scandir(path) as entries:
+                audio_paths.extend(sorted(
+                    entry.path for entry in entries
+                    if entry.is_file() and os.path.splitext(entry.name)[1][1:].lower() in AUDIO_EXTENSIONS
+                ))
+        else:
+            audio_paths.append(path)
+    return audio_paths
+
+def default_output_path(audio_path: str, output_format: str) -> str:
+    """
+    Place the video next to the source file, with the extension of the selected format
+    """
+    output_directory = os.path.dirname(audio_path)
+    output_filename = os.path.splitext(os.path.basename(audio_path))[0] + '.' + output_format
+    return os.path.join(output_directory, output_filename)
 
-def parse_arguments():
+def convert_file(audio_path: str, output_path: str, vis_type: Optional[str] = None, **kwargs: Any) -> bool:
+    """
+    Convert one audio file, creating a visualization if a type is given; return whether it succeeded
+    """
+    try:
+        if vis_type:
+            create_audio_visualization(audio_path, output_path, vis_type, **kwargs)
+        else:
+            create_simple_video(audio_path, output_path, **kwargs)
+    except Exception as e:
+        logging.error(f"Failed to convert {audio_path}: {e}")
+        return False
+    return True
+
+def parse_arguments() -> argparse.Namespace:
     # Supported video formats
     supported_formats = ['mp4', 'mov', 'mpeg1', 'mpeg2', 'mpeg4', 'mpg', 'avi', 'wmv', 'mpegps', 'flv', '3gpp', 'webm']
     
     parser = argparse.ArgumentParser(description='Convert audio to video')
-    parser.add_argument('audio_path', type=str, help='Path to the input audio file')
+    parser.add_argument('audio_path', type=str, nargs='+',
+                        help='Input audio files, or directories of .mp3/.m4a/.wav files')
     parser.add_argument('--output_path', type=str, help='Path to the output video file (optional)')
     parser.add_argument('--format', type=str, choices=supported_formats, default='mp4',
                         help='Output video format (default: mp4)')
     parser.add_argument('--vis_type', type=str, choices=['waveform', 'spectrogram', 'circular', 'bar_graph'],
                         help='Create a visualization video instead of a simple conversion')
-    return parser.parse_args()
+    parser.add_argument('--hwaccel', type=str, choices=['auto', 'none', 'nvenc', 'qsv', 'videotoolbox', 'amf'],
+                        default='auto',
+                        help='Hardware H.264 encoder to use; auto picks the first one that works (default: auto)')
+    parser.add_argument('--preset', type=str, default='ultrafast',
+                        choices=['ultrafast', 'superfast', 'veryfast', 'faster', 'fast', 'medium', 'slow',
+                                 'slower', 'veryslow'],
+                        help='x264 encoding preset (default: ultrafast)')
+    parser.add_argument('--tune', type=str, choices=['fastdecode', 'zerolatency'],
+                        help='Additional x264 tune (default: fastdecode for 3gpp and flv)')
+    parser.add_argument('--fps', type=int,
+                        help='Output frame rate (default: 1, enough for a still background)')
+    parser.add_argument('--fragmented', action='store_true',
+                        help='Write fragmented MP4, streamable without a second faststart pass')
+    parser.add_argument('--jobs', type=int, default=max(1, (os.cpu_count() or 1) // 2),
+                        help='Number of files to convert in parallel (default: half the CPU count)')
+    args = parser.parse_args()
+    if args.output_path and (len(args.audio_path) > 1 or os.path.isdir(args.audio_path[0])):
+        parser.error('--output_path can only be used with a single input file')
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    if args.fps is not None and args.fps < 1:
+        parser.error('--fps must be at least 1')
+    return args
 
 if __name__ == "__main__":
     try:
         args = parse_arguments()
         
-        # Get the input audio file path
-        audio_path = args.audio_path
+        # Get the input audio file paths
+        audio_paths = expand_audio_paths(args.audio_path)
+        if not audio_paths:
+            raise FileNotFoundError(f"No audio files found in: {', '.join(args.audio_path)}")
         
-        # If no output path is specified, set the output path to the same directory as the source file
+        # If no output path is specified, save each video in the same directory as its source file
         if args.output_path:
-            output_path = args.output_path
+            jobs = [(audio_paths[0], args.output_path)]
         else:
-            # Always save in the same directory as the source file
-            output_directory = os.path.dirname(audio_path)
-            
-            # Use the selected format for the output file extension
-            output_filename = os.path.splitext(os.path.basename(audio_path))[0] + '.' + args.format
-            output_path = os.path.join(output_directory, output_filename)
-            logging.info(f"Output will be saved to: {output_path}")
+            jobs = []
+            seen_output_paths = set()
+            for audio_path in audio_paths:
+                output_path = default_output_path(audio_path, args.format)
+                if output_path in seen_output_paths:
+                    logging.warning(f"Skipping {audio_path}: {output_path} is already produced by another input")
+                    continue
+                seen_output_paths.add(output_path)
+                jobs.append((audio_path, output_path))
+                logging.info(f"Output will be saved to: {output_path}")
+        
+        # Pick the encoder once so every worker uses the same one without probing again
+        video_encoder = None if args.format == 'webm' else _resolve_video_encoder(args.hwaccel)
+        processes = min(args.jobs, len(jobs))
+        if video_encoder not in (None, 'libx264') and processes > HW_ENCODER_MAX_JOBS:
+            logging.info(f"Limiting to {HW_ENCODER_MAX_JOBS} parallel jobs for {video_encoder}")
+            processes = HW_ENCODER_MAX_JOBS
         
         # Create video based on visualization flag
-        if args.vis_type:
-            create_audio_visualization(audio_path, output_path, args.vis_type, args.format)
+        convert = functools.partial(convert_file, vis_type=args.vis_type, output_format=args.format,
+                                    hwaccel=args.hwaccel, video_encoder=video_encoder,
+                                    preset=args.preset, tune=args.tune,
+                                    fragmented=args.fragmented, fps=args.fps,
+                                    # Parallel progress bars would overwrite each other on the terminal
+                                    show_progress=processes == 1,
+                                    # One ffmpeg thread per file keeps parallel workers from oversubscribing the CPU
+                                    threads=1 if processes > 1 else 0)
+        if processes > 1:
+            with multiprocessing.Pool(processes) as pool:
+                results = pool.starmap(convert, jobs)
         else:
-            create_simple_video(audio_path, output_path, args.format)
+            results = [convert(audio_path, output_path) for audio_path, output_path in jobs]
+        
+        # Every file is attempted; report failures once the batch is done
+        failures = results.count(False)
+        if failures:
+            logging.error(f"{failures} of {len(jobs)} files failed to convert")
+            sys.exit(1)
         
         logging.info("Script completed successfully")
     except Exception as e: